@@ -0,0 +1,63 @@
+import math
+import torch
+import torch.nn as nn
+from typing import Optional
+
+# Add the project root to the Python path
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+def excitation_probs(inputs, weights, shots: Optional[int] = None):
+    """
+    Closed-form P(1) of every qubit of the memory circuit.
+
+    Each qubit sees RY(x0) RZ(x1) RY(w0) RZ(w1) on |0> with no entanglement, so the
+    final RZ does not change Z-basis probabilities and the Bloch z-component is
+    cos(x0)cos(w0) - sin(x0)cos(x1)sin(w0). Returns a tensor of shape (batch_size, num_qubits).
+    """
+    num_qubits = weights.shape[0] // 2
+    x = inputs.view(-1, num_qubits, 2)
+    w = weights.view(num_qubits, 2)
+    z = torch.cos(x[..., 0]) * torch.cos(w[:, 0]) - torch.sin(x[..., 0]) * torch.cos(x[..., 1]) * torch.sin(w[:, 0])
+    p1 = (1 - z) / 2
+    if shots is not None:
+        # Gaussian approximation of the binomial shot noise of a finite-shot estimate.
+        # The std is detached: its derivative diverges at p1 = 0 or 1 and is not a real gradient.
+        noise_std = torch.sqrt(p1 * (1 - p1) / shots).detach()
+        p1 = p1 + torch.randn_like(p1) * noise_std
+        p1 = p1.clamp(0.0, 1.0)
+    return p1
+
+def product_probs(p1):
+    """
+    Full basis-state distribution of a product state from per-qubit P(1).
+    Wire 0 is the most significant bit, matching qml.probs.
+    """
+    probs = torch.stack((1 - p1[:, 0], p1[:, 0]), dim=1)
+    for i in range(1, p1.size(1)):
+        q_probs = torch.stack((1 - p1[:, i], p1[:, i]), dim=1)
+        probs = (probs.unsqueeze(2) * q_probs.unsqueeze(1)).flatten(1)
+    return probs
+
+class QuantumNeuronLevelModel(nn.Module):
+    """
+    Analytic Quantum Neuron-Level Model.
+    Computes the noiseless output distribution of the memory circuit in closed form,
+    so no simulator is involved and gradients flow through autograd. Set `shots` to
+    add Gaussian shot noise matching a finite-shot estimate.
+    """
+    def __init__(self, num_qubits, memory_length, hidden_size, slot_index=0, shots: Optional[int] = None):
+        super().__init__()
+        self.num_qubits = num_qubits
+        self.num_circuit_inputs = 2 * num_qubits
+        self.num_weights = num_qubits * 2
+        self.slot_index = slot_index
+        self.shots = shots
+
+        # Same initialisation as qml.qnn.TorchLayer
+        self.weights = nn.Parameter(torch.empty(self.num_weights))
+        nn.init.uniform_(self.weights, 0, 2 * math.pi)
+
+    def forward(self, inputs):
+        return product_probs(excitation_probs(inputs, self.weights, self.shots))
@@ -0,0 +1,86 @@
+import math
+import torch
+import torch.nn as nn
+from typing import Callable, List, Optional
+
+from quantum_ctm.analytic.quantum_memory_cell import excitation_probs, product_probs
+from quantum_ctm.utils.sync import run_pair_circuits
+
+class CorrelationLayer(nn.Module):
+    """
+    Closed-form output distribution of two memory circuits entangled by CNOT(0, num_qubits_i).
+    """
+    def __init__(self, q_model_i, q_model_j):
+        super().__init__()
+        self.num_qubits_i = q_model_i.num_qubits
+        self.num_qubits_j = q_model_j.num_qubits
+        self.num_inputs_i = q_model_i.num_circuit_inputs
+        self.num_inputs_j = q_model_j.num_circuit_inputs
+        self.num_weights_i = q_model_i.num_weights
+        self.num_weights_j = q_model_j.num_weights
+        self.shots = q_model_i.shots
+
+        self.weights = nn.Parameter(torch.empty(self.num_weights_i + self.num_weights_j))
+        nn.init.uniform_(self.weights, 0, 2 * math.pi)
+
+    def forward(self, inputs):
+        inputs_i, inputs_j = torch.split(inputs, [self.num_inputs_i, self.num_inputs_j], dim=1)
+        weights_i, weights_j = torch.split(self.weights, [self.num_weights_i, self.num_weights_j])
+
+        # Both circuits act on disjoint wires, so before the CNOT the state is a product state
+        p1 = torch.cat((excitation_probs(inputs_i, weights_i, self.shots),
+                        excitation_probs(inputs_j, weights_j, self.shots)), dim=1)
+        probs = product_probs(p1)
+
+        # CNOT(0, num_qubits_i) permutes basis states: flip the target bit where the control is 1
+        batch_size = probs.size(0)
+        probs = probs.view(batch_size, 2, 2 ** (self.num_qubits_i - 1), 2, 2 ** (self.num_qubits_j - 1))
+        probs = torch.stack((probs[:, 0], probs[:, 1].flip(2)), dim=1)
+        return probs.reshape(batch_size, -1)
+
+class QuantumSynchronizationLayer(nn.Module):
+    """
+    Computes a synchronization vector by measuring the correlation between pairs of quantum memory slots analytically.
+    """
+    def __init__(self, q_memory_models: nn.ModuleList, q_trace_processors: nn.ModuleList):
+        super().__init__()
+        self.q_memory_models = q_memory_models
+        self.q_trace_processors = q_trace_processors
+        self.num_slots = len(q_memory_models)
+        self._create_correlation_circuits()
+
+    def _create_correlation_circuits(self):
+        self.correlation_connectors = nn.ModuleList()
+
+        for i in range(self.num_slots):
+            for j in range(i + 1, self.num_slots):
+                self.correlation_connectors.append(CorrelationLayer(self.q_memory_models[i], self.q_memory_models[j]))
+
+    def forward(self, state_trace: torch.Tensor, slot_params: Optional[List[torch.Tensor]] = None,
+                run_jobs: Optional[Callable] = None) -> torch.Tensor:
+        if slot_params is None:
+            batch_size = state_trace.size(0)
+            flat_trace = state_trace.view(batch_size, -1)
+            slot_params = [proc(flat_trace) for proc in self.q_trace_processors]
+
+        # Execute the correlation circuits (concurrently if the caller provides a job runner)
+        pair_output_probs = run_pair_circuits(self.correlation_connectors, slot_params, run_jobs)
+
+        sync_values_all_items = []
+        connector_idx = 0
+        for i in range(self.num_slots):
+            for j in range(i + 1, self.num_slots):
+                q_output_probs = pair_output_probs[connector_idx]
+
+                num_qubits_i = self.q_memory_models[i].num_qubits
+                num_qubits_j = self.q_memory_models[j].num_qubits
+                if num_qubits_i == 1 and num_qubits_j == 1:
+                    sync_metric = q_output_probs[:, 1] + q_output_probs[:, 2]
+                else:
+                    sync_metric = torch.mean(q_output_probs, dim=1)
+
+                sync_values_all_items.append(sync_metric.unsqueeze(1))
+                connector_idx += 1
+
+        sync_vector = torch.cat(sync_values_all_items, dim=1)
+        return sync_vector
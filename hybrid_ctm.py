@@ -3,6 +3,9 @@ import torch.nn as nn
 import torch.nn.functional as F
 import argparse
 import importlib
+from functools import lru_cache
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
 from torchvision.models import resnet18, ResNet18_Weights
 import numpy as np
 
@@ -13,12 +16,23 @@ def layer_init(layer, std=np.sqrt(2), bias_const=0.0):
     torch.nn.init.constant_(layer.bias, bias_const)
     return layer
 
+def quantize_for_cpu_inference(model: nn.Module) -> nn.Module:
+    """Returns a copy of `model` with its nn.Linear layers dynamically quantized to int8 (CPU inference only)."""
+    return torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+
+@lru_cache(maxsize=None)
+def _compiled(fn):
+    """torch.compile of the plain function `fn`, built once on first use and shared by all models."""
+    return torch.compile(fn)
+
 class HybridCTM(nn.Module):
     def __init__(self, input_size, hidden_size, output_dim, num_mem_slots,
                  num_qubits_per_slot, backend_mode: str = 'pennylane',
                  memory_length: int = 8, use_attention: bool = True,
                  backbone_type: str = 'resnet18', task_type: str = 'classification',
-                 action_size: int = None):
+                 action_size: int = None, sampler=None, num_concurrent_jobs: int = 1,
+                 use_bf16: bool = False, compile_classical: bool = False,
+                 shots: int = None):
         super(HybridCTM, self).__init__()
 
         self.input_size = input_size
@@ -31,6 +45,19 @@ class HybridCTM(nn.Module):
         self.backbone_type = backbone_type
         self.task_type = task_type
         self.action_size = action_size
+        # >1 evaluates the slots' (and synchronization pairs') quantum circuits concurrently,
+        # so jobs on a remote/threaded backend overlap instead of waiting one after another.
+        # Jobs sharing a Qiskit sampler are still serialized, see _job_lock. It has no effect
+        # with PennyLane, whose process-wide queuing context forces its jobs to run one by one.
+        self.num_concurrent_jobs = num_concurrent_jobs
+        self._job_executor = None
+        # Run the small per-slot classical layers in bfloat16 on CUDA; circuits still get float32
+        self.use_bf16 = use_bf16
+
+        # Finite-shot noise is only modelled by the analytic backend
+        if shots is not None and self.backend_mode != 'analytic':
+            raise ValueError(f"shots is only supported by the 'analytic' backend, got '{self.backend_mode}'")
+        qnlm_kwargs = {} if shots is None else {'shots': shots}
 
         # --- Dynamically import backend-specific modules ---
         try:
@@ -45,9 +72,6 @@ class HybridCTM(nn.Module):
         # --- Backbone for Image Processing ---
         self._create_backbone()
 
-        # Classical components
-        self.query_generator = nn.Linear(hidden_size, hidden_size)
-
         # --- Quantum Memory ---
         self.q_memory_models = nn.ModuleList()
         self.q_output_mappers = nn.ModuleList()
@@ -58,14 +82,17 @@ class HybridCTM(nn.Module):
                 num_qubits=num_qubits_per_slot,
                 memory_length=memory_length,
                 hidden_size=hidden_size,
-                slot_index=i
+                slot_index=i,
+                **qnlm_kwargs
             )
 
-            if self.backend_mode == 'pennylane':
+            if self.backend_mode in ('pennylane', 'analytic'):
                 torch_qnn = qnlm_factory
             else:
                 from qiskit_machine_learning.connectors import TorchConnector
-                qnn = qnlm_factory.create_qnn()
+                # All slots submit through one sampler primitive (the user's, or the shared default).
+                # For concurrent jobs each slot gets its own default sampler so slots can overlap.
+                qnn = qnlm_factory.create_qnn(sampler=sampler, share_default=num_concurrent_jobs <= 1)
                 initial_weights = torch.randn(qnn.num_weights)
                 torch_qnn = TorchConnector(qnn, initial_weights=initial_weights)
 
@@ -115,7 +142,9 @@ class HybridCTM(nn.Module):
             nn.ReLU()
         )
 
-        self.current_hidden_state = None
+        # The quantum calls are graph breaks, but the classical prefix and state update compile cleanly.
+        # Only a flag is stored: compiled bound methods on the instance would break deepcopy and pickle.
+        self.compile_classical = compile_classical and hasattr(torch, 'compile')
 
     def _create_backbone(self):
         if self.backbone_type == 'resnet18':
@@ -130,42 +159,136 @@ class HybridCTM(nn.Module):
             raise ValueError(f"Unsupported backbone type: {self.backbone_type}")
 
 
+    def _encode_input(self, x_batch):
+        features = self.backbone(x_batch).flatten(1)
+        return self.input_layer(features)
+
+    def _update_state(self, combined_representation):
+        return self.state_updater(combined_representation)
+
+    def _fuse_trace_processors(self):
+        """
+        Concatenates (first layers) and stacks (last layers) every slot's trace-processor weights
+        for _process_traces. Built once per forward, since the weights can't change within one.
+        Returns None when the layers aren't plain nn.Linear (quantized, parametrized, or hooked
+        layers), since their weights can't be read and fused directly.
+        """
+        first_layers = [proc[0] for proc in self.q_trace_processors]
+        last_layers = [proc[2] for proc in self.q_trace_processors]
+        if not all(type(layer) is nn.Linear and not layer._forward_hooks and not layer._forward_pre_hooks
+                   for layer in first_layers + last_layers):
+            return None
+        return (torch.cat([layer.weight for layer in first_layers]),
+                torch.cat([layer.bias for layer in first_layers]),
+                torch.stack([layer.weight for layer in last_layers]),
+                torch.stack([layer.bias for layer in last_layers]))
+
+    def _process_traces(self, flat_trace, fused_weights=None):
+        """
+        Runs every slot's trace processor on the same flattened trace as one GEMM per layer,
+        using the `fused_weights` from _fuse_trace_processors, instead of one launch per slot
+        and layer. Without them, each processor is called in turn.
+        Returns the per-slot circuit inputs as a list.
+        """
+        if fused_weights is None:
+            return [proc(flat_trace) for proc in self.q_trace_processors]
+        first_weight, first_bias, last_weight, last_bias = fused_weights
+
+        hidden = F.relu(F.linear(flat_trace, first_weight, first_bias))
+        hidden = hidden.view(flat_trace.size(0), self.num_mem_slots, -1)
+        slot_params = torch.einsum('bsh,sph->bsp', hidden, last_weight) + last_bias
+        return list(slot_params.unbind(1))
+
+    def close(self):
+        """Releases the worker threads used for concurrent quantum jobs."""
+        if getattr(self, '_job_executor', None) is not None:
+            self._job_executor.shutdown(wait=False)
+            self._job_executor = None
+
+    def __del__(self):
+        self.close()
+
+    def __getstate__(self):
+        # The worker pool can't be copied or pickled; copies start without one
+        state = self.__dict__.copy()
+        state['_job_executor'] = None
+        return state
+
+    def _job_lock(self, q_model):
+        """
+        Returns the lock serializing jobs that share `q_model`'s non-thread-safe state.
+        Qiskit samplers grow their circuit caches without locking, so jobs on the same
+        sampler are serialized process-wide (samplers may be shared across models).
+        The analytic backend is plain PyTorch and needs no lock.
+        """
+        if self.backend_mode == 'qiskit':
+            from quantum_ctm.qiskit.quantum_memory_cell import sampler_lock
+            return sampler_lock(q_model.neural_network.sampler)
+        return nullcontext()
+
+    def _run_quantum_jobs(self, q_models, q_inputs):
+        """Evaluates each quantum model on its inputs, concurrently if num_concurrent_jobs > 1."""
+        # PennyLane queues operations in a process-wide context, so its jobs always run in turn
+        if self.num_concurrent_jobs <= 1 or self.backend_mode == 'pennylane':
+            return [q_model(q_input) for q_model, q_input in zip(q_models, q_inputs)]
+
+        if self._job_executor is None:
+            self._job_executor = ThreadPoolExecutor(max_workers=self.num_concurrent_jobs)
+
+        # Grad mode is thread-local, so carry the caller's setting into the workers
+        grad_enabled = torch.is_grad_enabled()
+        def run_job(q_model, q_input, lock):
+            with torch.set_grad_enabled(grad_enabled), lock:
+                return q_model(q_input)
+
+        futures = [self._job_executor.submit(run_job, q_model, q_input, self._job_lock(q_model))
+                   for q_model, q_input in zip(q_models, q_inputs)]
+        return [future.result() for future in futures]
+
     def forward(self, x_batch, iterations: int = 10):
         batch_size = x_batch.size(0)
 
         # 1. Process input with backbone
-        features = self.backbone(x_batch).flatten(1)
-        processed_input = self.input_layer(features)
+        encode_input, update_state = type(self)._encode_input, type(self)._update_state
+        if self.compile_classical:
+            encode_input, update_state = _compiled(encode_input), _compiled(update_state)
+        processed_input = encode_input(self, x_batch)
 
         kv = processed_input.unsqueeze(1)
         recurrent_hidden_state = torch.relu(processed_input)
         state_trace = torch.zeros(batch_size, self.hidden_size, self.memory_length, device=x_batch.device)
 
-        predictions_over_time = []
-        certainties_over_time = []
+        # Outputs are written into preallocated (batch, ..., iterations) buffers instead of
+        # collecting per-step tensors and concatenating them at the end
+        if self.task_type != 'rl':
+            all_predictions = processed_input.new_empty(batch_size, self.output_dim, iterations)
+        if self.use_attention:
+            all_certainties = processed_input.new_empty(batch_size, iterations)
+        else:
+            # Fake certainty if not using attention
+            all_certainties = processed_input.new_ones(batch_size, iterations)
 
+        # The trace processors' weights are fused once here rather than on every iteration
+        fused_trace_weights = self._fuse_trace_processors()
         for i in range(iterations):
             flat_trace = state_trace.view(batch_size, -1)
 
             # --- Quantum Memory Access ---
             # Simplified: For now, we assume all slots are accessed in each step.
             # A more sophisticated mechanism could select slots.
-            memory_output_components = []
-            for slot_idx in range(self.num_mem_slots):
-                q_model = self.q_memory_models[slot_idx]
-                q_mapper = self.q_output_mappers[slot_idx]
-                q_trace_proc = self.q_trace_processors[slot_idx]
-
-                slot_params = q_trace_proc(flat_trace)
-                slot_q_output_probs = q_model(slot_params)
-                slot_memory_output = q_mapper(slot_q_output_probs)
-                memory_output_components.append(slot_memory_output)
+            use_bf16 = self.use_bf16 and x_batch.is_cuda
+            with torch.autocast(device_type='cuda', dtype=torch.bfloat16, enabled=use_bf16):
+                slot_params_all = [slot_params.float() for slot_params in self._process_traces(flat_trace, fused_trace_weights)]
+            slot_q_output_probs = self._run_quantum_jobs(self.q_memory_models, slot_params_all)
+            with torch.autocast(device_type='cuda', dtype=torch.bfloat16, enabled=use_bf16):
+                memory_output_components = [q_mapper(probs).float() for q_mapper, probs in zip(self.q_output_mappers, slot_q_output_probs)]
 
             # Average the outputs from all memory slots
             memory_output_batch = torch.mean(torch.stack(memory_output_components), dim=0)
 
             if self.use_attention:
-                sync_vector = self.sync_layer(state_trace)
+                # Reuse the slot inputs above instead of re-running every trace processor per pair
+                sync_vector = self.sync_layer(state_trace, slot_params_all, run_jobs=self._run_quantum_jobs)
                 sync_action = sync_vector[:, :self.d_action]
                 sync_out = sync_vector[:, self.d_action:]
 
@@ -179,32 +302,24 @@ class HybridCTM(nn.Module):
                     # In RL, the output is handled by actor/critic heads
                     pass
                 else:
-                    step_output = self.output_projector(sync_out)
-                    predictions_over_time.append(step_output.unsqueeze(-1))
+                    all_predictions[..., i] = self.output_projector(sync_out)
 
-                step_certainty = self.certainty_head(sync_out)
+                all_certainties[:, i:i + 1] = self.certainty_head(sync_out)
             else:
                 combined_representation = recurrent_hidden_state
                 if self.task_type == 'rl':
                     pass
                 else:
-                    step_output = self.output_projector(recurrent_hidden_state)
-                    predictions_over_time.append(step_output.unsqueeze(-1))
-                # Fake certainty if not using attention
-                step_certainty = torch.ones(batch_size, 1, device=x_batch.device)
+                    all_predictions[..., i] = self.output_projector(recurrent_hidden_state)
 
-            recurrent_hidden_state = self.state_updater(combined_representation)
+            recurrent_hidden_state = update_state(self, combined_representation)
             state_trace = torch.cat((state_trace[..., 1:], recurrent_hidden_state.unsqueeze(-1)), dim=-1)
 
-            certainties_over_time.append(step_certainty)
-
         # Final processing depends on the task
         if self.task_type == 'rl':
             # For RL, we return the final hidden state to be used by actor/critic
             return recurrent_hidden_state, sync_out if self.use_attention else None
         else:
-            all_predictions = torch.cat(predictions_over_time, dim=-1)
-            all_certainties = torch.cat(certainties_over_time, dim=1)
             return all_predictions, all_certainties
 
     def get_value(self, x, iterations: int = 10):
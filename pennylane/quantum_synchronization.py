@@ -2,9 +2,10 @@ import torch
 import torch.nn as nn
 import pennylane as qml
 from pennylane import numpy as np
-from typing import List
+from typing import Callable, List, Optional
 
 from quantum_ctm.pennylane.quantum_memory_cell import memory_circuit_template
+from quantum_ctm.utils.sync import run_pair_circuits
 
 class QuantumSynchronizationLayer(nn.Module):
     """
@@ -53,24 +54,21 @@ class QuantumSynchronizationLayer(nn.Module):
                 corr_layer = qml.qnn.TorchLayer(correlation_circuit, weight_shapes)
                 self.correlation_connectors.append(corr_layer)
 
-    def forward(self, state_trace: torch.Tensor) -> torch.Tensor:
-        batch_size = state_trace.size(0)
-        flat_trace = state_trace.view(batch_size, -1)
-        
+    def forward(self, state_trace: torch.Tensor, slot_params: Optional[List[torch.Tensor]] = None,
+                run_jobs: Optional[Callable] = None) -> torch.Tensor:
+        if slot_params is None:
+            batch_size = state_trace.size(0)
+            flat_trace = state_trace.view(batch_size, -1)
+            slot_params = [proc(flat_trace) for proc in self.q_trace_processors]
+
+        # Execute the correlation circuits (concurrently if the caller provides a job runner)
+        pair_output_probs = run_pair_circuits(self.correlation_connectors, slot_params, run_jobs)
+
         sync_values_all_items = []
         connector_idx = 0
         for i in range(self.num_slots):
             for j in range(i + 1, self.num_slots):
-                corr_connector = self.correlation_connectors[connector_idx]
-                proc_i = self.q_trace_processors[i]
-                proc_j = self.q_trace_processors[j]
-                
-                params_i = proc_i(flat_trace)
-                params_j = proc_j(flat_trace)
-                
-                combined_params = torch.cat([params_i, params_j], dim=1)
-                
-                q_output_probs = corr_connector(combined_params)
+                q_output_probs = pair_output_probs[connector_idx]
                 
                 num_qubits_i = len(self.q_memory_models[i].qnode.device.wires)
                 num_qubits_j = len(self.q_memory_models[j].qnode.device.wires)
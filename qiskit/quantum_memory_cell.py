@@ -1,16 +1,63 @@
 import torch
 import torch.nn as nn
-from typing import Tuple
+import threading
+import weakref
+from typing import Optional
 
 # Add the project root to the Python path
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from qiskit import QuantumCircuit
-from qiskit.circuit import Parameter
+from qiskit import QuantumCircuit, QuantumRegister
+from qiskit.circuit import ParameterVector
 from qiskit_machine_learning.neural_networks import SamplerQNN
 
+# Sampler reused by every QNN created without an explicit one, so repeated model
+# instances share a single primitive and its backend connection. Only a weak reference
+# is kept: the sampler (and the circuits it caches) is freed with the last QNN using it.
+_shared_sampler = None
+
+# One lock per sampler primitive, shared by every model in the process. Samplers grow
+# their circuit caches without locking, so all jobs on one sampler must be serialized.
+_sampler_locks = weakref.WeakKeyDictionary()
+_sampler_locks_guard = threading.Lock()
+
+def release_shared_sampler():
+    """Drops the module-level sampler; the next QNN created will start a new one."""
+    global _shared_sampler
+    _shared_sampler = None
+
+def sampler_lock(sampler) -> threading.Lock:
+    """Returns the process-wide lock to hold while running a job on `sampler`."""
+    with _sampler_locks_guard:
+        lock = _sampler_locks.get(sampler)
+        if lock is None:
+            lock = _sampler_locks[sampler] = threading.Lock()
+        return lock
+
+def aer_sampler(shots: Optional[int] = None):
+    """
+    Returns an Aer sampler for the memory and correlation circuits.
+    They only contain RY, RZ and CX, which Aer executes natively with no coupling-map
+    constraints, so the per-run transpilation pass is skipped. `shots=None` gives exact
+    probabilities, like the default reference sampler.
+    """
+    from qiskit_aer.primitives import Sampler as AerSampler
+    return AerSampler(run_options={"shots": shots}, skip_transpilation=True)
+
+def memory_circuit_template(circuit, inputs, weights, qubits):
+    """Appends the gates of a single memory cell to `qubits` of `circuit` (no measurements)."""
+    # Feature map encodes the classical features into the quantum state.
+    # A simple encoding where each qubit gets two rotation gates parameterized by input features.
+    for i, qubit in enumerate(qubits):
+        circuit.ry(inputs[2*i], qubit)
+        circuit.rz(inputs[2*i + 1], qubit)
+    # Ansatz represents the trainable weights of the QNLM
+    for i, qubit in enumerate(qubits):
+        circuit.ry(weights[2*i], qubit)
+        circuit.rz(weights[2*i + 1], qubit)
+
 class QuantumNeuronLevelModel:
     """
     This class constructs a Qiskit SamplerQNN that acts as a Quantum Neuron-Level Model.
@@ -25,42 +72,49 @@ class QuantumNeuronLevelModel:
         # The number of parameters for the feature map circuit
         self.num_circuit_inputs = 2 * num_qubits
         
-        # Define the feature map and ansatz for our QNN
-        self._feature_map, self._ansatz = self._create_circuit()
+        # Parameter vectors for the feature map inputs and the ansatz weights.
+        # ParameterVector elements sort by index, so `parameters` stays in gate order
+        # (plain Parameters sort by name and put x_10 before x_2).
+        self._input_vector = ParameterVector(f'x_s{self.slot_index}', self.num_circuit_inputs)
+        self._weight_vector = ParameterVector(f'w_s{self.slot_index}', self.num_qubits * 2) # Example: 2 weights per qubit
         
-        # Define the full circuit and its parameters
-        self.circuit = self._feature_map.compose(self._ansatz)
-        self.input_params = list(self._feature_map.parameters)
-        self.weight_params = list(self._ansatz.parameters)
+        # Define the full circuit and its parameters. The circuit is a parameterized
+        # template built once; the sampler only binds values per call.
+        self.circuit = self._create_circuit()
+        self.input_params = list(self._input_vector)
+        self.weight_params = list(self._weight_vector)
 
-    def _create_circuit(self) -> Tuple[QuantumCircuit, QuantumCircuit]:
-        """Creates the feature map and ansatz circuits."""
-        
-        # Feature map encodes the classical features into the quantum state.
-        feature_map = QuantumCircuit(self.num_qubits, name=f"FeatureMap_s{self.slot_index}")
-        feature_params = [Parameter(f'x_s{self.slot_index}_{i}') for i in range(self.num_circuit_inputs)]
-        
-        # A simple encoding where each qubit gets two rotation gates parameterized by input features.
-        for i in range(self.num_qubits):
-            feature_map.ry(feature_params[2*i], i)
-            feature_map.rz(feature_params[2*i + 1], i)
+    def _create_circuit(self) -> QuantumCircuit:
+        """Creates the memory circuit: the feature map followed by the ansatz on a single register."""
+        qr = QuantumRegister(self.num_qubits, 'q')
+        circuit = QuantumCircuit(qr, name=f"Memory_s{self.slot_index}")
+        memory_circuit_template(circuit, self._input_vector, self._weight_vector, qr)
+        return circuit
 
-        # Ansatz represents the trainable weights of the QNLM
-        ansatz = QuantumCircuit(self.num_qubits, name=f"Ansatz_s{self.slot_index}")
-        num_weights = self.num_qubits * 2 # Example: 2 weights per qubit
-        weight_params = [Parameter(f'w_s{self.slot_index}_{i}') for i in range(num_weights)]
-        for i in range(self.num_qubits):
-            ansatz.ry(weight_params[2*i], i)
-            ansatz.rz(weight_params[2*i + 1], i)
-        
-        return feature_map, ansatz
+    def create_qnn(self, sampler=None, share_default: bool = True) -> SamplerQNN:
+        """
+        Instantiates and returns the SamplerQNN.
+
+        Args:
+            sampler: Optional sampler primitive. Pass the same sampler to every slot so
+                all batched jobs go through one primitive instead of one per slot.
+                Defaults to the module-level shared sampler.
+            share_default: If False and no sampler is given, the QNN gets its own default
+                sampler instead of the shared one (needed to run slots concurrently, since
+                samplers are not thread-safe).
+        """
+        global _shared_sampler
+        shared = _shared_sampler() if _shared_sampler is not None else None
 
-    def create_qnn(self) -> SamplerQNN:
-        """Instantiates and returns the SamplerQNN."""
-        
         qnn = SamplerQNN(
             circuit=self.circuit,
             input_params=self.input_params,
             weight_params=self.weight_params,
+            sampler=sampler if sampler is not None or not share_default else shared,
+            # Back-propagate (parameter-shift) gradients to the inputs as well, so the
+            # trace processors that produce them are trained through the circuit
+            input_gradients=True,
         )
+        if sampler is None and share_default and shared is None:
+            _shared_sampler = weakref.ref(qnn.sampler)
         return qnn 
\ No newline at end of file
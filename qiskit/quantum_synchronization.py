@@ -1,6 +1,6 @@
 import torch
 import torch.nn as nn
-from typing import List
+from typing import Callable, List, Optional
 
 # Add the project root to the Python path
 import sys
@@ -12,6 +12,9 @@ from qiskit.circuit.parameter import Parameter
 from qiskit_machine_learning.neural_networks import SamplerQNN
 from qiskit_machine_learning.connectors import TorchConnector
 
+from quantum_ctm.qiskit.quantum_memory_cell import memory_circuit_template
+from quantum_ctm.utils.sync import run_pair_circuits
+
 class QuantumSynchronizationLayer(nn.Module):
     """
     Computes a synchronization vector by measuring the correlation between pairs of quantum memory slots.
@@ -49,9 +52,12 @@ class QuantumSynchronizationLayer(nn.Module):
                 # Create a new circuit to measure correlation
                 corr_circuit = QuantumCircuit(num_qubits_i + num_qubits_j, name=f'sync_{i}-{j}')
                 
-                # Apply the original circuits for each slot
-                corr_circuit.compose(qnn_i.circuit, qubits=range(num_qubits_i), inplace=True)
-                corr_circuit.compose(qnn_j.circuit, qubits=range(num_qubits_i, num_qubits_i + num_qubits_j), inplace=True)
+                # Emit each slot's memory gates directly onto its qubits (same parameters as the slot's
+                # QNN), rather than copying the slot circuits in with compose
+                memory_circuit_template(corr_circuit, qnn_i.input_params, qnn_i.weight_params,
+                                        range(num_qubits_i))
+                memory_circuit_template(corr_circuit, qnn_j.input_params, qnn_j.weight_params,
+                                        range(num_qubits_i, num_qubits_i + num_qubits_j))
 
                 # Add CNOTs to entangle the first qubit of each slot
                 corr_circuit.cx(0, num_qubits_i)
@@ -64,10 +70,13 @@ class QuantumSynchronizationLayer(nn.Module):
 
                 # Create a QNN for this correlation circuit
                 # The output will be the probability distribution of the combined system
+                # Reuse the slots' sampler so correlation jobs share the same primitive
                 corr_qnn = SamplerQNN(
                     circuit=corr_circuit,
                     input_params=input_params,
-                    weight_params=weight_params
+                    weight_params=weight_params,
+                    sampler=qnn_i.sampler,
+                    input_gradients=True
                 )
                 
                 # Wrap in a TorchConnector
@@ -76,34 +85,32 @@ class QuantumSynchronizationLayer(nn.Module):
                 corr_connector = TorchConnector(corr_qnn, initial_weights=initial_weights)
                 self.correlation_connectors.append(corr_connector)
 
-    def forward(self, state_trace: torch.Tensor) -> torch.Tensor:
+    def forward(self, state_trace: torch.Tensor, slot_params: Optional[List[torch.Tensor]] = None,
+                run_jobs: Optional[Callable] = None) -> torch.Tensor:
         """
         Args:
             state_trace: The history of hidden states, shape (batch_size, hidden_size, memory_length).
+            slot_params: Optional per-slot circuit inputs already computed by the trace processors
+                for this trace. If omitted, each processor is run once here.
+            run_jobs: Optional callable taking (connectors, inputs) and returning their outputs,
+                used to evaluate the correlation circuits concurrently.
         
         Returns:
             A synchronization vector of shape (batch_size, num_pairs).
         """
-        batch_size = state_trace.size(0)
-        flat_trace = state_trace.view(batch_size, -1)
-        
+        if slot_params is None:
+            batch_size = state_trace.size(0)
+            flat_trace = state_trace.view(batch_size, -1)
+            slot_params = [proc(flat_trace) for proc in self.q_trace_processors]
+
+        # Execute the correlation circuits (concurrently if the caller provides a job runner)
+        pair_output_probs = run_pair_circuits(self.correlation_connectors, slot_params, run_jobs)
+
         sync_values_all_items = []
         connector_idx = 0
         for i in range(self.num_slots):
             for j in range(i + 1, self.num_slots):
-                corr_connector = self.correlation_connectors[connector_idx]
-                proc_i = self.q_trace_processors[i]
-                proc_j = self.q_trace_processors[j]
-                
-                # Process the trace for each model in the pair
-                params_i = proc_i(flat_trace)
-                params_j = proc_j(flat_trace)
-                
-                # Combine parameters for the correlation circuit
-                combined_params = torch.cat([params_i, params_j], dim=1)
-                
-                # Execute the correlation circuit
-                q_output_probs = corr_connector(combined_params)
+                q_output_probs = pair_output_probs[connector_idx]
                 
                 # Calculate a synchronization metric.
                 # Here, we assume 1 qubit per slot for simplicity to get P(01) + P(10).
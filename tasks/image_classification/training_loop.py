@@ -1,7 +1,7 @@
 import torch
 import torch.nn as nn
 import torch.optim as optim
-python quantum_ctm/tasks/image_classification/training_loop.py --epochs 1 --batch_size 32 --backend pennylanefrom torch.utils.data import DataLoader
+from torch.utils.data import DataLoader
 import numpy as np
 import time
 import argparse
@@ -96,7 +96,8 @@ def main():
     parser.add_argument("--memory_length", type=int, default=8)
     parser.add_argument("--save_path", type=str, default="hybrid_ctm_mnist.pth")
     parser.add_argument("--device", type=str, default="auto")
-    parser.add_argument("--backend", type=str, default="pennylane", choices=["qiskit", "pennylane"])
+    parser.add_argument("--backend", type=str, default="pennylane", choices=["qiskit", "pennylane", "analytic"])
+    parser.add_argument("--shots", type=int, default=None)
     args = parser.parse_args()
 
     device = 'cuda' if torch.cuda.is_available() and args.device == 'auto' else 'cpu'
@@ -120,6 +121,7 @@ def main():
         num_qubits_per_slot=args.num_qubits_per_slot,
         memory_length=args.memory_length,
         backend_mode=args.backend,
+        shots=args.shots,
         backbone_type='resnet18',
         task_type='classification',
         use_attention=True
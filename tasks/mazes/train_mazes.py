@@ -56,7 +56,8 @@ def plot_maze(maze, path=None, title=""):
 
 def main():
     parser = argparse.ArgumentParser(description="Quantum CTM for Maze Solving")
-    parser.add_argument('--backend', type=str, default='pennylane', choices=['pennylane', 'qiskit'], help='Quantum backend to use.')
+    parser.add_argument('--backend', type=str, default='pennylane', choices=['pennylane', 'qiskit', 'analytic'], help='Quantum backend to use.')
+    parser.add_argument('--shots', type=int, default=None, help='Shot count to emulate with the analytic backend (default: exact probabilities).')
     parser.add_argument('--data_root', type=str, default='data/mazes/medium', help='Root directory of the maze dataset.')
     parser.add_argument('--epochs', type=int, default=10, help='Number of training epochs.')
     parser.add_argument('--batch_size', type=int, default=4, help='Batch size for training.')
@@ -100,6 +101,7 @@ def main():
         num_mem_slots=args.num_mem_slots,
         num_qubits_per_slot=args.num_qubits_per_slot,
         backend_mode=args.backend,
+        shots=args.shots,
         use_attention=True,
         backbone_type='resnet18' # Specify the backbone
     ).to(args.device)
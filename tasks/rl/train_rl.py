@@ -78,7 +78,8 @@ def main():
     parser.add_argument("--num_mem_slots", type=int, default=3, help="Number of quantum memory slots.")
     parser.add_argument("--iterations", type=int, default=5, help="Number of recurrent iterations in the CTM.")
     parser.add_argument("--memory_length", type=int, default=8, help="Length of the memory trace for the QNLMs.")
-    parser.add_argument("--backend", type=str, default="pennylane", choices=["qiskit", "pennylane"], help="Quantum backend to use.")
+    parser.add_argument("--backend", type=str, default="pennylane", choices=["qiskit", "pennylane", "analytic"], help="Quantum backend to use.")
+    parser.add_argument("--shots", type=int, default=None, help="Shot count to emulate with the analytic backend (default: exact probabilities).")
 
     args = parser.parse_args()
     args.batch_size = int(args.num_envs * args.num_steps)
@@ -107,6 +108,7 @@ def main():
         num_mem_slots=args.num_mem_slots,
         num_qubits_per_slot=args.num_qubits_per_slot,
         backend_mode=args.backend,
+        shots=args.shots,
         memory_length=args.memory_length,
         backbone_type='linear',
         task_type='rl',
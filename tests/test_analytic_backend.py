@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+analytic_memory = pytest.importorskip("quantum_ctm.analytic.quantum_memory_cell")
+analytic_sync = pytest.importorskip("quantum_ctm.analytic.quantum_synchronization")
+
+
+def ry(theta):
+    c, s = np.cos(theta / 2), np.sin(theta / 2)
+    return np.array([[c, -s], [s, c]], dtype=complex)
+
+
+def rz(theta):
+    return np.diag([np.exp(-0.5j * theta), np.exp(0.5j * theta)])
+
+
+def memory_state(inputs, weights):
+    """State vector of one memory circuit (RY RZ on the inputs, then RY RZ on the weights), wire 0 as MSB."""
+    state = np.ones(1, dtype=complex)
+    for q in range(len(weights) // 2):
+        gate = rz(weights[2 * q + 1]) @ ry(weights[2 * q]) @ rz(inputs[2 * q + 1]) @ ry(inputs[2 * q])
+        state = np.kron(state, gate @ np.array([1, 0], dtype=complex))
+    return state
+
+
+def cnot(state, control, target):
+    num_qubits = int(np.log2(state.size))
+    out = state.copy()
+    for index in range(state.size):
+        if index >> (num_qubits - 1 - control) & 1:
+            out[index ^ (1 << (num_qubits - 1 - target))] = state[index]
+    return out
+
+
+@pytest.mark.parametrize("num_qubits", [1, 2, 3])
+def test_memory_cell_matches_state_vector(num_qubits):
+    torch.manual_seed(0)
+    model = analytic_memory.QuantumNeuronLevelModel(num_qubits, memory_length=2, hidden_size=4)
+    inputs = torch.rand(5, model.num_circuit_inputs, dtype=torch.float64) * 2 * np.pi
+
+    probs = model(inputs.float()).double()
+
+    weights = model.weights.detach().double().numpy()
+    expected = [np.abs(memory_state(x, weights)) ** 2 for x in inputs.float().double().numpy()]
+    np.testing.assert_allclose(probs.detach().numpy(), np.stack(expected), atol=1e-5)
+
+
+@pytest.mark.parametrize("num_qubits_i, num_qubits_j", [(1, 1), (2, 1), (1, 2), (2, 3)])
+def test_correlation_layer_matches_state_vector(num_qubits_i, num_qubits_j):
+    torch.manual_seed(0)
+    model_i = analytic_memory.QuantumNeuronLevelModel(num_qubits_i, memory_length=2, hidden_size=4)
+    model_j = analytic_memory.QuantumNeuronLevelModel(num_qubits_j, memory_length=2, hidden_size=4, slot_index=1)
+    layer = analytic_sync.CorrelationLayer(model_i, model_j)
+    inputs = torch.rand(5, model_i.num_circuit_inputs + model_j.num_circuit_inputs) * 2 * np.pi
+
+    probs = layer(inputs).detach().double().numpy()
+
+    weights = layer.weights.detach().double().numpy()
+    weights_i, weights_j = weights[:model_i.num_weights], weights[model_i.num_weights:]
+    expected = []
+    for x in inputs.double().numpy():
+        x_i, x_j = x[:model_i.num_circuit_inputs], x[model_i.num_circuit_inputs:]
+        state = np.kron(memory_state(x_i, weights_i), memory_state(x_j, weights_j))
+        expected.append(np.abs(cnot(state, 0, num_qubits_i)) ** 2)
+    np.testing.assert_allclose(probs, np.stack(expected), atol=1e-5)
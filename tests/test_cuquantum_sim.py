@@ -0,0 +1,52 @@
+import math
+
+import pytest
+
+cp = pytest.importorskip("cupy")
+cuquantum_sim = pytest.importorskip("quantum_ctm.cuquantum_sim")
+
+if not cuquantum_sim.HAS_CUQUANTUM:
+    pytest.skip("cuQuantum Python bindings not found", allow_module_level=True)
+
+
+def test_sampled_probs_z_matches_marginals():
+    sim = cuquantum_sim.CuQuantumSimulator(3)
+    sim.ry(math.pi / 2, 0)
+    sim.ry(math.pi, 2)
+    qubits = [0, 1, 2]
+    p1, shots_used = sim.sampled_probs_z(qubits, target_sigma=1e-2, max_shots=1 << 14)
+    exact = sim.marginal_probs_z(qubits)[0]
+    assert p1.shape == (3,)
+    assert 0 < shots_used <= 1 << 14
+    assert cp.allclose(p1, exact, atol=0.05)
+    sim.release()
+
+
+@pytest.mark.parametrize("initial_shots, max_shots", [(0, 8192), (-4, 8192), (64, 32), (0, 0)])
+def test_sampled_probs_z_rejects_bad_shot_counts(initial_shots, max_shots):
+    sim = cuquantum_sim.CuQuantumSimulator(2)
+    with pytest.raises(ValueError):
+        sim.sampled_probs_z([0, 1], initial_shots=initial_shots, max_shots=max_shots)
+    sim.release()
+
+
+def test_batched_gates_match_single_state_simulators():
+    num_qubits, num_states = 3, 4
+    ry_angles = [0.3, 1.1, math.pi, 2.5]
+    rz_angles = [0.7, -0.4, 1.9, math.pi / 3]
+    batched = cuquantum_sim.CuQuantumSimulator(num_qubits, num_states=num_states)
+    for qubit in range(num_qubits):
+        batched.ry_batched(ry_angles, qubit)
+        batched.rz_batched(rz_angles, qubit)
+    # Same gate on every state goes through the num_states > 1 broadcast path
+    batched.ry(0.5, 1)
+
+    for k in range(num_states):
+        single = cuquantum_sim.CuQuantumSimulator(num_qubits)
+        for qubit in range(num_qubits):
+            single.ry(ry_angles[k], qubit)
+            single.rz(rz_angles[k], qubit)
+        single.ry(0.5, 1)
+        assert cp.allclose(batched.states[k], single.state, atol=1e-12)
+        single.release()
+    batched.release()
@@ -0,0 +1,71 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+hybrid_ctm = pytest.importorskip("quantum_ctm.hybrid_ctm")
+
+
+def make_model(**kwargs):
+    torch.manual_seed(0)
+    return hybrid_ctm.HybridCTM(input_size=8, hidden_size=8, output_dim=3, num_mem_slots=3,
+                                num_qubits_per_slot=2, backend_mode='analytic', memory_length=2,
+                                backbone_type='linear', **kwargs)
+
+
+@pytest.mark.parametrize("num_concurrent_jobs", [1, 2])
+def test_quantized_model_matches_float(num_concurrent_jobs):
+    model = make_model(num_concurrent_jobs=num_concurrent_jobs).eval()
+    x = torch.randn(4, 8)
+    with torch.no_grad():
+        # Also creates the job pool when num_concurrent_jobs > 1, which the copy must skip
+        expected_predictions, expected_certainties = model(x, iterations=2)
+        quantized = hybrid_ctm.quantize_for_cpu_inference(model)
+        predictions, certainties = quantized(x, iterations=2)
+    # int8 weight error at these sizes is ~1e-3 or below; allow 1e-2
+    torch.testing.assert_close(predictions, expected_predictions, atol=1e-2, rtol=0)
+    torch.testing.assert_close(certainties, expected_certainties, atol=1e-2, rtol=0)
+
+
+def test_fused_trace_processors_match_per_slot():
+    model = make_model()
+    flat_trace = torch.randn(4, model.hidden_size * model.memory_length)
+    fused = model._process_traces(flat_trace, model._fuse_trace_processors())
+    expected = [proc(flat_trace) for proc in model.q_trace_processors]
+    assert len(fused) == len(expected)
+    for slot_params, slot_expected in zip(fused, expected):
+        torch.testing.assert_close(slot_params, slot_expected)
+
+
+def test_concurrent_jobs_match_sequential():
+    x = torch.randn(4, 8)
+    results = []
+    for num_concurrent_jobs in (1, 2):
+        model = make_model(num_concurrent_jobs=num_concurrent_jobs)
+        predictions, certainties = model(x, iterations=3)
+        (predictions.sum() + certainties.sum()).backward()
+        grads = {name: param.grad for name, param in model.named_parameters() if param.grad is not None}
+        results.append((predictions.detach(), certainties.detach(), grads))
+        model.close()
+
+    (predictions_seq, certainties_seq, grads_seq), (predictions_par, certainties_par, grads_par) = results
+    torch.testing.assert_close(predictions_par, predictions_seq)
+    torch.testing.assert_close(certainties_par, certainties_seq)
+    assert grads_par.keys() == grads_seq.keys() and grads_seq
+    for name, grad in grads_seq.items():
+        torch.testing.assert_close(grads_par[name], grad, msg=f"gradient mismatch for {name}")
+
+
+def test_concurrent_slot_jobs_match_sequential():
+    # forward doesn't feed the slot circuits' outputs into its results, so check their gradients directly
+    torch.manual_seed(1)
+    inputs = [torch.randn(4, 4, requires_grad=True) for _ in range(3)]
+    results = []
+    for num_concurrent_jobs in (1, 2):
+        model = make_model(num_concurrent_jobs=num_concurrent_jobs)
+        outputs = model._run_quantum_jobs(model.q_memory_models, inputs)
+        grads = torch.autograd.grad(sum(out.pow(2).sum() for out in outputs),
+                                    inputs + [q_model.weights for q_model in model.q_memory_models])
+        results.append((outputs, grads))
+        model.close()
+
+    for expected, actual in zip(*[outputs + list(grads) for outputs, grads in results]):
+        torch.testing.assert_close(actual, expected)
@@ -0,0 +1,18 @@
+import torch
+
+
+def run_pair_circuits(correlation_connectors, slot_params, run_jobs=None):
+    """
+    Evaluates each slot pair's correlation circuit on the concatenated circuit inputs of its two slots.
+
+    Pairs are ordered (0, 1), (0, 2), ..., (1, 2), ..., matching `correlation_connectors`.
+    If `run_jobs` is given, it is called as `run_jobs(connectors, inputs)` to evaluate the
+    circuits (e.g. concurrently); otherwise they are run one after another.
+    Returns the list of per-pair outputs.
+    """
+    num_slots = len(slot_params)
+    pair_params = [torch.cat([slot_params[i], slot_params[j]], dim=1)
+                   for i in range(num_slots) for j in range(i + 1, num_slots)]
+    if run_jobs is not None:
+        return run_jobs(correlation_connectors, pair_params)
+    return [connector(params) for connector, params in zip(correlation_connectors, pair_params)]